@@ -1,11 +1,24 @@
 import os
-import time
 import math
+import re
+import hashlib
+import tempfile
+import functools
+import queue
+import threading
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import filedialog, messagebox, ttk
+import numpy as np
 import pandas as pd
 from PIL import Image, ImageTk
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
 
 # ---------------- CONFIG ----------------
 THUMB_SIZE = (120, 120)
@@ -13,37 +26,92 @@ ROWS = 4
 COLS = 5
 IMAGES_PER_PAGE = ROWS * COLS
 MAX_THUMB_CACHE = 300
+RECENT_PHOTOS = 4 * IMAGES_PER_PAGE
+DECODE_WORKERS = 6
+RESULT_POLL_MS = 30
+DISK_CACHE_DIR = Path(tempfile.gettempdir()) / "gallery_gui_thumbs"
+DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+HELPER_COLUMNS = ["__dir_lower__", "__file_lower__"]
+APPLY_DELAY_MS = 150
+MARK_COLOR = "gold"
+NUMEXPR_MIN_FILTERS = 3
+# NumPy's iterator caps operands at 32 on 1.x (64 on 2.x), output included
+NUMEXPR_MAX_COLUMNS = 31
 # ----------------------------------------
 
 
-class ThumbnailCache:
-    def __init__(self, max_size):
-        self.cache = OrderedDict()
-        self.max_size = max_size
+class DiskThumbCache:
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # Approximate until the first prune() scans the directory
+        self.size = 0
+        self._lock = threading.Lock()
+
+    def _cache_path(self, path):
+        mtime = os.path.getmtime(path)
+        key = hashlib.blake2b(
+            (path + str(mtime) + str(THUMB_SIZE)).encode(), digest_size=16
+        ).hexdigest()
+        return self.cache_dir / f"{key}.png"
+
+    def contains(self, path):
+        try:
+            return self._cache_path(path).exists()
+        except OSError:
+            return False
 
     def get(self, path):
-        if path in self.cache:
-            self.cache.move_to_end(path)
-            return self.cache[path][0]
-        return None
+        try:
+            cache_path = self._cache_path(path)
+            img = Image.open(cache_path)
+            img.load()
+            # Refresh mtime so pruning drops the least recently used files
+            os.utime(cache_path)
+            return img
+        except (OSError, ValueError):
+            return None
 
     def put(self, path, image):
-        self.cache[path] = (image, time.time())
-        self.cache.move_to_end(path)
-        self._cleanup()
-
-    def _cleanup(self):
-        while len(self.cache) > self.max_size:
-            self.cache.popitem(last=False)
-
-    def purge_unused(self, max_age_seconds=900):
-        now = time.time()
-        keys_to_remove = [
-            k for k, (_, t) in self.cache.items()
-            if now - t > max_age_seconds
-        ]
-        for k in keys_to_remove:
-            del self.cache[k]
+        try:
+            cache_path = self._cache_path(path)
+            # Write then rename so concurrent readers never see partial files
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.{id(image)}.tmp")
+            image.save(tmp_path, "PNG", optimize=False)
+            os.replace(tmp_path, cache_path)
+            with self._lock:
+                self.size += cache_path.stat().st_size
+                over = self.size > self.max_bytes
+        except (OSError, ValueError):
+            return
+        if over:
+            self.prune()
+
+    def is_full(self):
+        return self.size >= self.max_bytes * 0.9
+
+    def prune(self):
+        # Delete oldest files until the cache is back under 90% of its cap
+        with self._lock:
+            entries = []
+            for p in self.cache_dir.glob("*.png"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            for _, size, p in entries:
+                if total <= self.max_bytes * 0.9:
+                    break
+                try:
+                    p.unlink()
+                    total -= size
+                except OSError:
+                    pass
+            self.size = total
 
 
 class ImageGallery(tk.Tk):
@@ -53,16 +121,46 @@ class ImageGallery(tk.Tk):
         self.geometry("1400x850")
 
         self.df = None
-        self.filtered_df = None
+        self.filtered_positions = None
+        self.marked_positions = None
         self.page = 0
         self.marked_page = 0
         self.selected_index = None
 
-        self.thumb_cache = ThumbnailCache(MAX_THUMB_CACHE)
+        # In-memory LRU of decoded PIL thumbnails, keyed by (path, mtime)
+        self._cached_thumb = functools.lru_cache(maxsize=MAX_THUMB_CACHE)(
+            lambda path, mtime: self._decode_thumb(path)
+        )
+        # Recently shown PhotoImages, so cache hits render synchronously
+        self._photos = OrderedDict()
+        self.disk_cache = DiskThumbCache(DISK_CACHE_DIR, DISK_CACHE_MAX_BYTES)
+        self.loader = ThreadPoolExecutor(max_workers=DECODE_WORKERS)
+        self.warmup_loader = ThreadPoolExecutor(max_workers=1)
+        self._closing = threading.Event()
+        self._prefetch_slots = threading.BoundedSemaphore(2 * DECODE_WORKERS)
+        self._render_token = 0
+        # Workers only enqueue finished decodes; Tk is touched on this thread
+        self._results = queue.Queue()
+        self._pending_apply = None
+        self._pending_reset_page = True
+        self._applied_slider_values = None
+        self._gallery_dirty = False
+        self._marked_dirty = False
+        self._blank_img = tk.PhotoImage(
+            width=THUMB_SIZE[0], height=THUMB_SIZE[1]
+        )
 
         self._load_dataframe()
         self._build_layout()
         self._apply_filters()
+        self.after_idle(self._warm_disk_cache)
+        self._poll_results()
+
+    def destroy(self):
+        self._closing.set()
+        self.loader.shutdown(wait=False, cancel_futures=True)
+        self.warmup_loader.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
 
     # ---------- DATA ----------
     def _load_dataframe(self):
@@ -75,30 +173,69 @@ class ImageGallery(tk.Tk):
             return
 
         self.dataset_name = os.path.basename(self.dataset_path)
-        self.df = pd.read_csv(self.dataset_path)
+        try:
+            # Multi-threaded Arrow parser; falls back when pyarrow is missing or
+            # its type inference fails (ArrowInvalid surfaces as a ValueError)
+            self.df = pd.read_csv(self.dataset_path, engine="pyarrow")
+        except (ImportError, ValueError):
+            self.df = pd.read_csv(self.dataset_path)
 
         if not {"dir", "file"}.issubset(self.df.columns):
             messagebox.showerror("Error", "Dataframe must contain 'dir' and 'file'")
             self.destroy()
             return
 
-        # Mark column
-        if "__marked__" not in self.df.columns:
-            self.df["__marked__"] = False
+        # Marks live in a uint8 array; the column is only rebuilt when saving
+        if "__marked__" in self.df.columns:
+            self._marked_col_loc = self.df.columns.get_loc("__marked__")
+            self._marked = (
+                self.df["__marked__"].fillna(False).to_numpy(dtype=bool)
+                .astype(np.uint8)
+            )
+            self.df.drop(columns=["__marked__"], inplace=True)
+        else:
+            self._marked_col_loc = None
+            self._marked = np.zeros(len(self.df), dtype=np.uint8)
+        self._marked_count = int(self._marked.sum())
+
+        self._dir_col_idx = self.df.columns.get_loc("dir")
+        self._file_col_idx = self.df.columns.get_loc("file")
+
+        # Row positions per filename for "Show same filename"
+        self._file_to_indices = self.df.groupby("file", sort=False).indices
+
+        # Lowercased copies for the text filters, never saved
+        self.df["__dir_lower__"] = self.df["dir"].str.lower()
+        self.df["__file_lower__"] = self.df["file"].str.lower()
 
         # Column types
+        skip = ("dir", "file", "__marked__", "Unnamed: 0", *HELPER_COLUMNS)
         self.numeric_keys = [
             c for c in self.df.columns
-            if c not in ("dir", "file", "__marked__", "Unnamed: 0")
+            if c not in skip
             and pd.api.types.is_numeric_dtype(self.df[c])
         ]
 
+        self.numeric_bounds = {}
+        for c in self.numeric_keys:
+            values = self.df[c].to_numpy(dtype=float)
+            if np.isnan(values).all():
+                self.numeric_bounds[c] = (0.0, 1.0)
+            else:
+                self.numeric_bounds[c] = (float(np.nanmin(values)),
+                                          float(np.nanmax(values)))
+
         self.category_keys = [
             c for c in self.df.columns
-            if c not in ("dir", "file", "__marked__", "Unnamed: 0")
+            if c not in skip
             and c not in self.numeric_keys
         ]
 
+        # Repeated labels compare as integer codes once stored as categories
+        for c in self.category_keys:
+            if len(self.df) and self.df[c].nunique() / len(self.df) < 0.5:
+                self.df[c] = self.df[c].astype("category")
+
     # ---------- LAYOUT ----------
     def _build_layout(self):
         main = tk.PanedWindow(self, orient="horizontal")
@@ -131,26 +268,32 @@ class ImageGallery(tk.Tk):
         # Directory filter by name
         tk.Label(filters, text="Dir contains").grid(row=row, column=0, sticky="w")
         self.dir_search_var = tk.StringVar()
-        tk.Entry(filters, textvariable=self.dir_search_var, width=25)\
-            .grid(row=row, column=1, columnspan=2)
+        dir_entry = tk.Entry(filters, textvariable=self.dir_search_var, width=25)
+        dir_entry.grid(row=row, column=1, columnspan=2)
+        dir_entry.bind("<KeyRelease>", lambda e: self._schedule_apply())
         row += 1
         # File name filter
         tk.Label(filters, text="File contains").grid(row=row, column=0, sticky="w")
         self.file_search_var = tk.StringVar()
-        tk.Entry(filters, textvariable=self.file_search_var, width=25)\
-            .grid(row=row, column=1, columnspan=2)
+        file_entry = tk.Entry(filters, textvariable=self.file_search_var, width=25)
+        file_entry.grid(row=row, column=1, columnspan=2)
+        file_entry.bind("<KeyRelease>", lambda e: self._schedule_apply())
         row += 1
 
         for key in self.numeric_keys:
             tk.Label(filters, text=key).grid(row=row, column=0, sticky="w")
 
-            mn = tk.DoubleVar(value=0.0)
-            mx = tk.DoubleVar(value=1.0)
+            lo, hi = self.numeric_bounds[key]
+            resolution = self._slider_resolution(key)
+            mn = tk.DoubleVar(value=lo)
+            mx = tk.DoubleVar(value=hi)
 
-            tk.Scale(filters, from_=0, to=1, resolution=0.01,
-                     orient="horizontal", variable=mn, length=120).grid(row=row, column=1)
-            tk.Scale(filters, from_=0, to=1, resolution=0.01,
-                     orient="horizontal", variable=mx, length=120).grid(row=row, column=2)
+            tk.Scale(filters, from_=lo, to=hi, resolution=resolution,
+                     orient="horizontal", variable=mn, length=120,
+                     command=self._on_slider).grid(row=row, column=1)
+            tk.Scale(filters, from_=lo, to=hi, resolution=resolution,
+                     orient="horizontal", variable=mx, length=120,
+                     command=self._on_slider).grid(row=row, column=2)
 
             self.numeric_filters[key] = (mn, mx)
             row += 1
@@ -158,18 +301,25 @@ class ImageGallery(tk.Tk):
         for key in self.category_keys:
             tk.Label(filters, text=key).grid(row=row, column=0, sticky="w")
 
-            values = ["All"] + sorted(self.df[key].dropna().unique().tolist())
+            col = self.df[key]
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                options = col.cat.categories.tolist()
+            else:
+                options = col.dropna().unique().tolist()
+            values = ["All"] + sorted(options)
             var = tk.StringVar(value="All")
-            ttk.Combobox(filters, values=values,
-                         textvariable=var, state="readonly",
-                         width=18).grid(row=row, column=1, columnspan=2)
+            combo = ttk.Combobox(filters, values=values,
+                                 textvariable=var, state="readonly", width=18)
+            combo.grid(row=row, column=1, columnspan=2)
+            combo.bind("<<ComboboxSelected>>", lambda e: self._schedule_apply())
 
             self.category_filters[key] = var
             row += 1
 
         self.hide_marked_var = tk.BooleanVar(value=False)
         tk.Checkbutton(filters, text="Hide marked files",
-                       variable=self.hide_marked_var).grid(
+                       variable=self.hide_marked_var,
+                       command=self._schedule_apply).grid(
             row=row, column=0, columnspan=3, sticky="w"
         )
 
@@ -198,6 +348,8 @@ class ImageGallery(tk.Tk):
 
         self.gallery_tabs.add(self.gallery_frame, text="Gallery")
         self.gallery_tabs.add(self.marked_frame, text="Marked")
+        self.gallery_tabs.bind("<<NotebookTabChanged>>",
+                               lambda e: self._render_visible())
 
         self._build_gallery(self.gallery_frame, marked=False)
         self._build_gallery(self.marked_frame, marked=True)
@@ -206,11 +358,22 @@ class ImageGallery(tk.Tk):
         thumb_frame = tk.Frame(parent)
         thumb_frame.pack()
 
+        # Fixed grid of labels, reconfigured on every render
+        labels = [
+            [tk.Label(thumb_frame, image=self._blank_img, bd=2, highlightthickness=2)
+             for c in range(COLS)]
+            for r in range(ROWS)
+        ]
+        for r, row_labels in enumerate(labels):
+            for c, lbl in enumerate(row_labels):
+                lbl.grid(row=r, column=c, padx=5, pady=5)
+
         nav = tk.Frame(parent)
         nav.pack(pady=5)
 
         if marked:
             self.marked_thumb_frame = thumb_frame
+            self.marked_labels = labels
             tk.Button(nav, text="<< Prev",
                       command=self._prev_marked_page).pack(side="left", padx=5)
             self.marked_page_label = tk.Label(nav, text="Page 1 / 1")
@@ -223,6 +386,7 @@ class ImageGallery(tk.Tk):
                       command=self._export_marked_txt).pack(side="left", padx=10)
         else:
             self.thumb_frame = thumb_frame
+            self.gallery_labels = labels
             tk.Button(nav, text="<< Prev",
                       command=self._prev_page).pack(side="left", padx=5)
             self.page_label = tk.Label(nav, text="Page 1 / 1")
@@ -248,6 +412,14 @@ class ImageGallery(tk.Tk):
         self.table = ttk.Treeview(content, show="headings", height=2)
         self.table.pack(side="left", fill="x", expand=True)
 
+        # Columns never change after load: configure once, update one row
+        self.table["columns"] = self.numeric_keys + self.category_keys
+        for k in self.table["columns"]:
+            self.table.heading(k, text=k)
+            self.table.column(k, width=100, anchor="center")
+        self._table_col_idx = [self.df.columns.get_loc(k) for k in self.table["columns"]]
+        self._row_id = self.table.insert("", "end", values=self._empty_row())
+
         btns = tk.Frame(content)
         btns.pack(side="right", padx=10)
 
@@ -264,85 +436,331 @@ class ImageGallery(tk.Tk):
                         .pack(fill="x", pady=4)
 
     # ---------- FILTERING ----------
+    def _slider_values(self):
+        return tuple(
+            (mn.get(), mx.get()) for mn, mx in self.numeric_filters.values()
+        )
+
+    def _on_slider(self, value):
+        # Tk also fires -command when a Scale is first drawn; ignore that
+        if self._slider_values() != self._applied_slider_values:
+            self._schedule_apply()
+
+    def _schedule_apply(self, reset_page=True):
+        # Coalesce bursts of slider/keyboard events into one filter pass
+        self._cancel_pending_apply()
+        self._pending_reset_page = reset_page
+        self._pending_apply = self.after(
+            APPLY_DELAY_MS, lambda: self._do_apply(reset_page)
+        )
+
+    def _cancel_pending_apply(self):
+        if self._pending_apply:
+            self.after_cancel(self._pending_apply)
+            self._pending_apply = None
+
+    def _flush_pending_apply(self):
+        # Run a debounced pass now so actions see the filters as typed
+        if self._pending_apply:
+            self._apply_filters(reset_page=self._pending_reset_page)
+
+    def _slider_resolution(self, key):
+        lo, hi = self.numeric_bounds[key]
+        return (hi - lo) / 100 or 1
+
+    def _numeric_range(self, key):
+        # Scale rounds its value to the resolution, so a slider sitting at
+        # either end is treated as unbounded rather than as the rounded value
+        lo, hi = self.numeric_bounds[key]
+        tol = self._slider_resolution(key) / 2
+        mn, mx = self.numeric_filters[key]
+        low = -np.inf if mn.get() <= lo + tol else mn.get()
+        high = np.inf if mx.get() >= hi - tol else mx.get()
+        return low, high
+
+    def _apply_numeric_filters(self, mask):
+        # Sliders left at both ends filter nothing and are skipped entirely
+        ranges = []
+        for k in self.numeric_filters:
+            lo, hi = self._numeric_range(k)
+            if np.isfinite(lo) or np.isfinite(hi):
+                ranges.append((self.df[k].to_numpy(), lo, hi))
+
+        if (numexpr is not None
+                and NUMEXPR_MIN_FILTERS <= len(ranges) <= NUMEXPR_MAX_COLUMNS):
+            try:
+                np.logical_and(mask, self._numexpr_ranges(ranges), out=mask)
+                return
+            except ValueError:
+                pass
+
+        for col, lo, hi in ranges:
+            if np.isfinite(lo):
+                np.logical_and(mask, col >= lo, out=mask)
+            if np.isfinite(hi):
+                np.logical_and(mask, col <= hi, out=mask)
+
+    @staticmethod
+    def _numexpr_ranges(ranges):
+        # Fuse every range check into one numexpr kernel. Bounds are inlined
+        # as constants so only the columns count towards the operand limit
+        exprs = []
+        local_dict = {}
+        for i, (col, lo, hi) in enumerate(ranges):
+            if col.dtype == bool:
+                col = col.view(np.uint8)
+            local_dict[f"c{i}"] = col
+            if np.isfinite(lo):
+                exprs.append(f"(c{i} >= {float(lo)!r})")
+            if np.isfinite(hi):
+                exprs.append(f"(c{i} <= {float(hi)!r})")
+        return numexpr.evaluate(" & ".join(exprs), local_dict=local_dict)
+
+    def _do_apply(self, reset_page):
+        self._pending_apply = None
+        self._apply_filters(reset_page=reset_page)
+
     def _apply_filters(self, reset_page=True):
-        df = self.df.copy()
+        self._cancel_pending_apply()
+
+        # Single boolean mask, AND-reduced in place, applied once at the end
+        mask = np.ones(len(self.df), dtype=bool)
 
-        for k, (mn, mx) in self.numeric_filters.items():
-            df = df[(df[k] >= mn.get()) & (df[k] <= mx.get())]
+        self._apply_numeric_filters(mask)
 
         for k, var in self.category_filters.items():
             if var.get() != "All":
-                df = df[df[k] == var.get()]
+                hits = (self.df[k] == var.get()).to_numpy(dtype=bool)
+                np.logical_and(mask, hits, out=mask)
 
         dir_q = self.dir_search_var.get().strip().lower()
         if dir_q:
-            df = df[df["dir"].str.lower().str.contains(dir_q, case=False)]
-
-        file_q = self.file_search_var.get().strip().lower()
-        if file_q:
-            df = df[df["file"].str.lower().str.contains(file_q, case=False)]
+            hits = self.df["__dir_lower__"].str.contains(dir_q, regex=False, na=False)
+            np.logical_and(mask, hits.to_numpy(dtype=bool), out=mask)
+
+        # Several tokens match any of them through one compiled alternation
+        file_tokens = self.file_search_var.get().lower().split()
+        if len(file_tokens) == 1:
+            hits = self.df["__file_lower__"].str.contains(
+                file_tokens[0], regex=False, na=False
+            )
+            np.logical_and(mask, hits.to_numpy(dtype=bool), out=mask)
+        elif file_tokens:
+            pat = re.compile("|".join(map(re.escape, file_tokens)))
+            hits = self.df["__file_lower__"].str.contains(pat, regex=True, na=False)
+            np.logical_and(mask, hits.to_numpy(dtype=bool), out=mask)
 
         if self.hide_marked_var.get():
-            df = df[df["__marked__"] == False]
+            np.logical_and(mask, self._marked == 0, out=mask)
 
-        self.filtered_df = df.reset_index()
-        max_page = max(0, math.ceil(len(self.filtered_df) / IMAGES_PER_PAGE) - 1)
+        self._applied_slider_values = self._slider_values()
+        self.filtered_positions = np.flatnonzero(mask)
+        max_page = max(0, math.ceil(len(self.filtered_positions) / IMAGES_PER_PAGE) - 1)
         self.page = min(self.page, max_page)
         if reset_page:
             self.page = 0
         self.selected_index = None
-        self._render_gallery()
-        self._render_marked()
+        self._gallery_dirty = True
+        self._marked_dirty = True
+        self._render_visible()
         self._update_counts()
         self._update_info()
 
     # ---------- RENDER ----------
+    def _render_visible(self):
+        # Hidden tabs are only marked dirty and render when selected
+        current = self.gallery_tabs.index("current")
+        if current == 0 and self._gallery_dirty:
+            self._gallery_dirty = False
+            self._render_gallery()
+        elif current == 1 and self._marked_dirty:
+            self._marked_dirty = False
+            self._render_marked()
+
     def _render_gallery(self):
-        self._render_page(self.thumb_frame, self.filtered_df, self.page)
+        self._render_page(self.thumb_frame, self.filtered_positions, self.page)
         self._update_page_label()
 
     def _render_marked(self):
-        marked_df = self.df[self.df["__marked__"]].reset_index()
-        self._render_page(self.marked_thumb_frame, marked_df, self.marked_page)
+        self._render_page(self.marked_thumb_frame, self._get_marked_positions(),
+                          self.marked_page)
         self._update_marked_page_label()
 
-    def _render_page(self, frame, df, page):
-        self.thumb_cache.purge_unused()
-        for w in frame.winfo_children():
-            w.destroy()
+    def _get_marked_positions(self):
+        if self.marked_positions is None:
+            self.marked_positions = np.flatnonzero(self._marked)
+        return self.marked_positions
+
+    def _render_page(self, frame, positions, page):
+        labels = self.gallery_labels if frame is self.thumb_frame else self.marked_labels
+
+        # Late decodes from a previous render of this frame are discarded
+        self._render_token += 1
+        frame.render_token = self._render_token
+        frame.slots = {}
 
         start = page * IMAGES_PER_PAGE
-        page_df = df.iloc[start:start + IMAGES_PER_PAGE]
+        page_positions = positions[start:start + IMAGES_PER_PAGE]
+        paths = self._page_paths(page_positions)
+
+        for slot in range(IMAGES_PER_PAGE):
+            r, c = divmod(slot, COLS)
+            lbl = labels[r][c]
+
+            if slot >= len(page_positions):
+                self._clear_slot(lbl)
+                continue
+
+            pos = int(page_positions[slot])
+            path = paths[slot]
+
+            lbl.bind("<Button-1>", lambda e, idx=pos: self._select_row(idx))
+            self._set_mark_border(lbl, self._marked[pos])
+            frame.slots[pos] = lbl
+
+            photo = self._recent_photo(path)
+            if photo is not None:
+                lbl.configure(image=photo)
+                lbl.image = photo
+                continue
+
+            lbl.configure(image=self._blank_img)
+            lbl.image = None
+            future = self.loader.submit(self._load_thumb, path)
+            future.add_done_callback(
+                lambda f, path=path, lbl=lbl, token=self._render_token:
+                self._results.put((f, path, lbl, token))
+            )
 
-        for i, row in page_df.iterrows():
-            r, c = divmod(i - start, COLS)
-            path = os.path.join(row["dir"], row["file"])
+        self._prefetch_page(positions, page + 1)
 
-            thumb = self.thumb_cache.get(path)
-            if thumb is None:
-                try:
-                    img = Image.open(path)
-                    img.thumbnail(THUMB_SIZE)
-                    thumb = ImageTk.PhotoImage(img)
-                    self.thumb_cache.put(path, thumb)
-                except Exception:
-                    continue
+    def _prefetch_page(self, positions, page):
+        # Decode the following page while the current one is being viewed
+        start = page * IMAGES_PER_PAGE
+        for path in self._page_paths(positions[start:start + IMAGES_PER_PAGE]):
+            if path in self._photos:
+                continue
+            if not self._prefetch_slots.acquire(blocking=False):
+                return
+            future = self.loader.submit(self._load_thumb, path)
+            future.add_done_callback(lambda f, path=path: self._prefetched(f, path))
+
+    def _prefetched(self, future, path):
+        # Worker thread: the PhotoImage is built when the queue is drained
+        self._prefetch_slots.release()
+        self._results.put((future, path, None, None))
+
+    def _recent_photo(self, path):
+        photo = self._photos.get(path)
+        if photo is not None:
+            self._photos.move_to_end(path)
+        return photo
+
+    def _remember_photo(self, path, photo):
+        self._photos[path] = photo
+        self._photos.move_to_end(path)
+        while len(self._photos) > RECENT_PHOTOS:
+            self._photos.popitem(last=False)
+
+    def _row_path(self, pos):
+        return os.path.join(self.df.iat[pos, self._dir_col_idx],
+                            self.df.iat[pos, self._file_col_idx])
+
+    def _page_paths(self, page_positions):
+        # One fancy-index per column instead of a lookup per slot
+        dirs = self.df["dir"].to_numpy()[page_positions]
+        files = self.df["file"].to_numpy()[page_positions]
+        return [os.path.join(d, f) for d, f in zip(dirs, files)]
+
+    def _clear_slot(self, lbl):
+        lbl.configure(image=self._blank_img)
+        lbl.image = None
+        lbl.unbind("<Button-1>")
+        self._set_mark_border(lbl, False)
+
+    def _set_mark_border(self, lbl, marked):
+        lbl.configure(highlightbackground=MARK_COLOR if marked else lbl.cget("bg"))
+
+    def _load_thumb(self, path):
+        # Runs on a worker thread: only PIL work here, no Tk objects
+        return self._cached_thumb(path, os.path.getmtime(path))
+
+    def _decode_thumb(self, path):
+        img = self.disk_cache.get(path)
+        if img is not None:
+            return self._compact(img)
+
+        img = Image.open(path)
+        # Let libjpeg downscale during decode (no-op for other formats)
+        img.draft("RGB", (THUMB_SIZE[0] * 2, THUMB_SIZE[1] * 2))
+        img.thumbnail(THUMB_SIZE, Image.BILINEAR)
+        img = self._compact(img)
+        self.disk_cache.put(path, img)
+        return img
+
+    @staticmethod
+    def _compact(img):
+        # Bare L/RGB/RGBA pixels only: no EXIF/ICC payload or file handle kept
+        # in the cache, and PhotoImage needs no mode conversion on the Tk thread
+        if img.mode not in ("L", "RGB", "RGBA"):
+            has_alpha = (
+                img.mode in ("LA", "PA", "La", "RGBa")
+                or (img.mode == "P" and "transparency" in img.info)
+            )
+            img = img.convert("RGBA" if has_alpha else "RGB")
+        return Image.frombytes(img.mode, img.size, img.tobytes())
 
-            lbl = tk.Label(frame, image=thumb, bd=2)
-            lbl.image = thumb
-            lbl.grid(row=r, column=c, padx=5, pady=5)
-            lbl.bind("<Button-1>", lambda e, idx=row["index"]: self._select_row(idx))
+    def _warm_disk_cache(self):
+        # One long task on its own pool so it never delays the visible page
+        self.warmup_loader.submit(
+            self._warm_all, self.df["dir"].to_numpy(), self.df["file"].to_numpy()
+        )
+
+    def _warm_all(self, dirs, files):
+        self.disk_cache.prune()
+        for d, f in zip(dirs, files):
+            if self._closing.is_set() or self.disk_cache.is_full():
+                return
+            try:
+                path = os.path.join(d, f)
+                if not self.disk_cache.contains(path):
+                    self._decode_thumb(path)
+            except Exception:
+                continue
+
+    def _poll_results(self):
+        while True:
+            try:
+                future, path, lbl, token = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._apply_thumb(future, path, lbl, token)
+        self.after(RESULT_POLL_MS, self._poll_results)
+
+    def _apply_thumb(self, future, path, lbl, token):
+        # lbl is None for prefetches, which only fill the recent-photo map
+        stale = lbl is None or lbl.master.render_token != token
+        try:
+            thumb = ImageTk.PhotoImage(future.result())
+        except Exception:
+            if not stale:
+                self._clear_slot(lbl)
+            return
+        self._remember_photo(path, thumb)
+        if stale:
+            return
+        lbl.configure(image=thumb)
+        lbl.image = thumb
 
     # --------- UPDATE LABELS ----------
     def _update_page_label(self):
-        total_pages = max(1, math.ceil(len(self.filtered_df) / IMAGES_PER_PAGE))
+        total_pages = max(1, math.ceil(len(self.filtered_positions) / IMAGES_PER_PAGE))
         self.page_label.config(
             text=f"Page {self.page + 1} / {total_pages}"
         )
 
     def _update_marked_page_label(self):
-        marked_count = int(self.df["__marked__"].sum())
-        total_pages = max(1, math.ceil(marked_count / IMAGES_PER_PAGE))
+        total_pages = max(1, math.ceil(self._marked_count / IMAGES_PER_PAGE))
         self.marked_page_label.config(
             text=f"Page {self.marked_page + 1} / {total_pages}"
         )
@@ -352,9 +770,11 @@ class ImageGallery(tk.Tk):
         self.selected_index = idx
         self._update_info()
 
+    def _empty_row(self):
+        return [""] * len(self.table["columns"])
+
     def _update_info(self):
-        self.table.delete(*self.table.get_children())
-        self.table["columns"] = ()
+        self.table.item(self._row_id, values=self._empty_row())
         self.dir_file_lbl.config(text="")
         self.open_btn.config(state="disabled")
         self.mark_btn.config(state="disabled")
@@ -362,59 +782,83 @@ class ImageGallery(tk.Tk):
         if self.selected_index is None:
             return
 
-        r = self.df.loc[self.selected_index]
-        path = os.path.join(r["dir"], r["file"])
+        d = self.df.iat[self.selected_index, self._dir_col_idx]
+        f = self.df.iat[self.selected_index, self._file_col_idx]
 
         self.open_btn.config(state="normal")
         self.mark_btn.config(state="normal")
-        is_marked = bool(r["__marked__"])
+        is_marked = bool(self._marked[self.selected_index])
         self.mark_btn.config(text="Unmark" if is_marked else "Mark")
 
-        self.dir_file_lbl.config(text=f"Dir: {r['dir']}\nFile: {r['file']}")
-
-        self.table["columns"] = self.numeric_keys + self.category_keys
-        for k in self.table["columns"]:
-            self.table.heading(k, text=k)
-            self.table.column(k, width=100, anchor="center")
+        self.dir_file_lbl.config(text=f"Dir: {d}\nFile: {f}")
 
-        self.table.insert("", "end", values=[r[k] for k in self.table["columns"]])
+        self.table.item(self._row_id, values=[
+            self.df.iat[self.selected_index, i] for i in self._table_col_idx
+        ])
 
     def _toggle_same_name_filter(self):
         if not self.same_name_var.get() or self.selected_index is None:
             self._apply_filters()
             return
 
-        fname = self.df.at[self.selected_index, "file"]
-        self.filtered_df = (
-            self.df[self.df["file"] == fname]
-            .reset_index()
+        fname = self.df.iat[self.selected_index, self._file_col_idx]
+        self.filtered_positions = self._file_to_indices.get(
+            fname, np.empty(0, dtype=np.int64)
         )
         self.page = 0
-        self._render_gallery()
+        self._gallery_dirty = True
+        self._render_visible()
 
     # ---------- MARKING ----------
     def _toggle_mark(self):
         if self.selected_index is None:
             return
 
-        current = self.df.at[self.selected_index, "__marked__"]
-        self.df.at[self.selected_index, "__marked__"] = not current
-        self._apply_filters(reset_page=False)
+        self._marked[self.selected_index] ^= 1
+        marked = bool(self._marked[self.selected_index])
+        self._marked_count += 1 if marked else -1
+        self.marked_positions = None
+
+        if self.hide_marked_var.get():
+            self._schedule_apply(reset_page=False)
+            return
+
+        lbl = self.thumb_frame.slots.get(self.selected_index)
+        if lbl is not None:
+            self._set_mark_border(lbl, marked)
+        self._marked_dirty = True
+        self._render_visible()
+        self._update_info()
 
     def _mark_all_filtered(self):
-        self.df.loc[self.filtered_df["index"], "__marked__"] = True
+        self._flush_pending_apply()
+        self._marked_count += int(
+            np.count_nonzero(self._marked[self.filtered_positions] == 0)
+        )
+        self._marked[self.filtered_positions] = 1
+        self.marked_positions = None
         self._apply_filters(reset_page=False)
 
     def _clear_marked(self):
-        self.df["__marked__"] = False
+        self._marked.fill(0)
+        self._marked_count = 0
+        self.marked_positions = None
         self._apply_filters(reset_page=False)
 
+    def _export_df(self):
+        df = self.df.drop(columns=HELPER_COLUMNS, errors="ignore")
+        # Put the column back where it was read from, or append it
+        loc = len(df.columns) if self._marked_col_loc is None else self._marked_col_loc
+        df.insert(loc, "__marked__", self._marked.astype(bool))
+        return df
+
     def _save_marks_to_csv(self):
+        self._flush_pending_apply()
         if not self.dataset_path:
             messagebox.showerror("Error", "No dataset path available.")
             return
 
-        marked_count = int(self.df["__marked__"].sum())
+        marked_count = self._marked_count
 
         confirm = messagebox.askyesno(
             "Save marks",
@@ -428,7 +872,7 @@ class ImageGallery(tk.Tk):
             return
 
         try:
-            self.df.to_csv(self.dataset_path, index=False)
+            self._export_df().to_csv(self.dataset_path, index=False)
             messagebox.showinfo(
                 "Success",
                 f"Marks saved successfully.\n\n"
@@ -441,6 +885,7 @@ class ImageGallery(tk.Tk):
             )
 
     def _save_as_csv(self):
+        self._flush_pending_apply()
         path = filedialog.asksaveasfilename(
             defaultextension=".csv",
             filetypes=[("CSV files", "*.csv")]
@@ -449,7 +894,7 @@ class ImageGallery(tk.Tk):
             return
 
         try:
-            self.df.to_csv(path, index=False)
+            self._export_df().to_csv(path, index=False)
             messagebox.showinfo(
                 "Saved",
                 f"Dataset saved successfully:\n{path}"
@@ -458,9 +903,10 @@ class ImageGallery(tk.Tk):
             messagebox.showerror("Error", str(e))
 
     def _export_marked_txt(self):
-        marked_df = self.df[self.df["__marked__"]]
+        self._flush_pending_apply()
+        positions = self._get_marked_positions()
 
-        if marked_df.empty:
+        if not len(positions):
             messagebox.showinfo("Export", "No marked files to export.")
             return
 
@@ -472,13 +918,15 @@ class ImageGallery(tk.Tk):
             return
 
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                for _, r in marked_df.iterrows():
-                    f.write(os.path.join(r["dir"], r["file"]) + "\n")
+            # Same os.path.join as the gallery, without a per-row iterrows
+            paths = self._page_paths(positions)
+            with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                f.write("\n".join(paths))
+                f.write("\n")
 
             messagebox.showinfo(
                 "Export complete",
-                f"Exported {len(marked_df)} file paths."
+                f"Exported {len(paths)} file paths."
             )
         except Exception as e:
             messagebox.showerror("Error", str(e))
@@ -487,8 +935,7 @@ class ImageGallery(tk.Tk):
     def _open_full_image(self):
         if self.selected_index is None:
             return
-        r = self.df.loc[self.selected_index]
-        path = os.path.join(r["dir"], r["file"])
+        path = self._row_path(self.selected_index)
         try:
             img = Image.open(path)
         except Exception:
@@ -503,7 +950,7 @@ class ImageGallery(tk.Tk):
 
     # ---------- PAGINATION ----------
     def _next_page(self):
-        max_page = max(0, math.ceil(len(self.filtered_df) / IMAGES_PER_PAGE) - 1)
+        max_page = max(0, math.ceil(len(self.filtered_positions) / IMAGES_PER_PAGE) - 1)
         if self.page < max_page:
             self.page += 1
             self._render_gallery()
@@ -514,8 +961,7 @@ class ImageGallery(tk.Tk):
             self._render_gallery()
 
     def _next_marked_page(self):
-        marked_count = self.df["__marked__"].sum()
-        if (self.marked_page + 1) * IMAGES_PER_PAGE < marked_count:
+        if (self.marked_page + 1) * IMAGES_PER_PAGE < self._marked_count:
             self.marked_page += 1
             self._render_marked()
 
@@ -526,7 +972,7 @@ class ImageGallery(tk.Tk):
 
     def _update_counts(self):
         self.count_label.config(
-            text=f"Filtered: {len(self.filtered_df)} / {len(self.df)}"
+            text=f"Filtered: {len(self.filtered_positions)} / {len(self.df)}"
         )
 
 